@@ -1,8 +1,21 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, Response
+from functools import lru_cache
+from typing import NamedTuple
 import math
+import numpy as np
+import orjson
 
 app = Flask(__name__)
 
+def ojson(payload):
+    """
+    jsonify replacement built on orjson, which serializes the float-heavy
+    result payloads several times faster than the stdlib json module.
+    OPT_SERIALIZE_NUMPY also accepts NumPy scalars directly.
+    """
+    return Response(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+                    mimetype='application/json')
+
 # 1. Camera Calibration from Module 1
 # These values correspond to the original 1280x720 resolution.
 ORIG_FX = 991.396
@@ -22,20 +35,48 @@ def index():
     # in a 'static' folder next to app.py.
     return render_template('index.html')
 
+class Intrinsics(NamedTuple):
+    """Camera intrinsics scaled to a particular image resolution."""
+    fx: float
+    fy: float
+    cx: float
+    cy: float
+
+@lru_cache(maxsize=16)
 def get_scaled_intrinsics(img_w, img_h):
     """
-    Adjusts the focal length and center point if the user's uploaded 
+    Adjusts the focal length and center point if the user's uploaded
     photo resolution is different from the calibration resolution.
+
+    Cached on (img_w, img_h): nearly every request reuses the same
+    resolution, so repeat clicks hit the cache instead of recomputing.
     """
     scale_x = img_w / CALIB_W
     scale_y = img_h / CALIB_H
-    
+
     fx = ORIG_FX * scale_x
     fy = ORIG_FY * scale_y
     cx = ORIG_CX * scale_x
     cy = ORIG_CY * scale_y
-    
-    return fx, fy, cx, cy
+
+    return Intrinsics(fx, fy, cx, cy)
+
+def pixels_to_world(points, fx, fy, cx, cy, Z):
+    """
+    Back-projects pixel coordinates to world-plane coordinates at depth Z.
+
+    Vectorized over an (N, 2) array of (u, v) points so the endpoint can
+    handle polylines of any length, not just a single pair of clicks.
+    Formula per axis: X = (u - cx) * Z / fx, Y = (v - cy) * Z / fy.
+    Returns (X, Y) arrays of length N.
+    """
+    pts = np.asarray(points, dtype=np.float64)
+    # Precompute the depth/focal ratios once instead of per point
+    z_over_fx = Z / fx
+    z_over_fy = Z / fy
+    X = (pts[:, 0] - cx) * z_over_fx
+    Y = (pts[:, 1] - cy) * z_over_fy
+    return X, Y
 
 # --- STEP 1: Calculate Depth (Z) ---
 @app.route('/calculate_stereo', methods=['POST'])
@@ -54,14 +95,14 @@ def calculate_stereo():
     disparity = abs(p_left['x'] - p_right['x'])
     
     if disparity < 1.0:
-        return jsonify({"error": "Disparity is too small (d < 1.0). You clicked the same pixel or close to it!"})
+        return ojson({"error": "Disparity is too small (d < 1.0). You clicked the same pixel or close to it!"})
 
     # 2. Apply Stereo Vision Formula: Z = (f * B) / d
     calculated_Z = (fx * BASELINE) / disparity
 
     print(f"DEBUG: Disparity={disparity:.2f} px | Calculated Z={calculated_Z:.2f} cm")
 
-    return jsonify({
+    return ojson({
         "Z": round(calculated_Z, 4),
         "disparity": round(disparity, 2)
     })
@@ -79,25 +120,24 @@ def calculate_size():
     
     fx, fy, cx, cy = get_scaled_intrinsics(img_w, img_h)
 
-    # Convert 2D Pixel (u,v) to 3D World (X,Y) at depth Z
-    # Formula: X = (pixel_x - center_x) * Z / fx
-    X1 = (p1['x'] - cx) * Z / fx
-    Y1 = (p1['y'] - cy) * Z / fy
-    
-    X2 = (p2['x'] - cx) * Z / fx
-    Y2 = (p2['y'] - cy) * Z / fy
+    # Convert 2D Pixels (u,v) to 3D World (X,Y) at depth Z
+    X, Y = pixels_to_world([[p1['x'], p1['y']], [p2['x'], p2['y']]],
+                           fx, fy, cx, cy, Z)
 
-    # Euclidean distance in the X-Y plane
-    dx = X2 - X1
-    dy = Y2 - Y1
-    real_size = math.sqrt(dx**2 + dy**2)
+    # Euclidean distance in the X-Y plane (hypot avoids under/overflow
+    # in the intermediate squares and beats sqrt(dx**2 + dy**2))
+    dx = float(X[1] - X[0])
+    dy = float(Y[1] - Y[0])
+    real_size = math.hypot(dx, dy)
 
-    return jsonify({
+    return ojson({
         "size_cm": round(real_size, 4),
         "dX": round(abs(dx), 4),
         "dY": round(abs(dy), 4)
     })
 
+# Dev fallback only: Werkzeug's server handles one request at a time.
+# Production should run under Gunicorn via wsgi.py (see README section 5.1).
 if __name__ == '__main__':
     import os
     port = int(os.environ.get("PORT", 10000))  # Render gives the PORT
@@ -3,25 +3,58 @@ Real-Time Pose & Hand Tracking and Data Logging (pose_tracking.py)
 
 This script utilizes Google's MediaPipe Holistic model to perform comprehensive, 
 real-time tracking of the human body (Pose) and hands. All extracted 3D 
-landmark coordinates and visibility data are saved to a CSV file for subsequent 
-analysis, fulfilling the requirements for Module 7, Problem 3.
+landmark coordinates and visibility data are saved to a Parquet file for
+subsequent analysis, fulfilling the requirements for Module 7, Problem 3.
 """
 
 import cv2
 import mediapipe as mp
-import csv
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import queue
+import threading
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # --- CONFIGURATION CONSTANTS ---
-MIN_DETECTION_CONFIDENCE = 0.5
-MIN_TRACKING_CONFIDENCE = 0.5
-OUTPUT_CSV_FILE = 'pose_data.csv'
+# High detection / low tracking thresholds keep MediaPipe on its cheap
+# tracking path: the full (re-)detection graph only fires when tracking is
+# actually lost, instead of every frame.
+MIN_DETECTION_CONFIDENCE = 0.7
+MIN_TRACKING_CONFIDENCE = 0.3
+MODEL_COMPLEXITY = 0    # Lite pose model; 1 or 2 trade FPS for accuracy
+OUTPUT_PARQUET_FILE = 'pose_data.parquet'
 WINDOW_TITLE = 'Module 7 | Pose Tracking - Data Logging Active'
+CAMERA_INDICES = [0]    # Add indices (e.g. [0, 1]) to track several cameras
+ROW_BATCH_SIZE = 64     # Frames buffered before a single columnar flush
+READ_QUEUE_SIZE = 2     # Frames in flight between camera reader and inference
+WRITE_QUEUE_SIZE = 64   # Rows in flight between inference and Parquet writer
+PROCESS_WIDTH = 640     # Inference runs on a downsampled copy of the frame;
+PROCESS_HEIGHT = 360    # display and drawing stay at native camera resolution
+CAPTURE_WIDTH = 1280    # Requested webcam capture resolution
+CAPTURE_HEIGHT = 720
+
+# Explicit capture backend: autodetection often picks one that delivers raw
+# YUY2 frames, capping many webcams well below their MJPG frame rates.
+if sys.platform == 'win32':
+    CAPTURE_BACKEND = cv2.CAP_DSHOW
+elif sys.platform == 'darwin':
+    CAPTURE_BACKEND = cv2.CAP_AVFOUNDATION
+else:
+    CAPTURE_BACKEND = cv2.CAP_V4L2
 
 # Initialize MediaPipe Solutions
 mp_holistic = mp.solutions.holistic
 mp_drawing = mp.solutions.drawing_utils
-# mp_hands is used implicitly for connection names
+
+# Hoisted once at import: each of these is otherwise a chain of module
+# attribute + dict lookups through MediaPipe's lazily loaded solutions
+# package, repeated for every draw call on every frame.
+POSE_CONNECTIONS = mp_holistic.POSE_CONNECTIONS
+HAND_CONNECTIONS = mp.solutions.hands.HAND_CONNECTIONS
+draw_landmarks = mp_drawing.draw_landmarks
 
 # --- CUSTOM DRAWING STYLES (Aesthetic Improvement) ---
 # Define clean, professional colors for visualization
@@ -29,36 +62,51 @@ POSE_DRAWING_SPEC = mp_drawing.DrawingSpec(color=(63, 81, 181), thickness=2, cir
 HAND_DRAWING_SPEC = mp_drawing.DrawingSpec(color=(0, 150, 136), thickness=2, circle_radius=2) # Teal
 POSE_CONNECTIONS_SPEC = mp_drawing.DrawingSpec(color=(255, 179, 0), thickness=2) # Amber
 
+# --- STATIC OVERLAY (rendered once, blitted every frame) ---
+# The bottom banner never changes, so its antialiased text is rendered into a
+# small strip at import and copied onto each frame instead of going through
+# cv2.putText per frame. The mask keeps the video visible between glyphs.
+_BANNER_H, _BANNER_W = 20, 400
+_BANNER = np.zeros((_BANNER_H, _BANNER_W, 3), np.uint8)
+cv2.putText(_BANNER, "DATALOG: Active (Press 'q' to save/exit)", (0, 15),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1, cv2.LINE_AA)
+_BANNER_MASK = _BANNER.any(axis=2, keepdims=True)
+
 # --- FUNCTION TO EXTRACT DATA ---
+# Preallocated row buffer: 1 timestamp + 33*4 pose values + 21*3 hand values.
+# Reusing a single ndarray avoids 150+ list.extend reallocations per frame on
+# the hot logging path. float64 keeps full precision on the Unix timestamp.
+_ROW_BUF = np.zeros(1 + 132 + 63, dtype=np.float64)
+
 def extract_full_data(results):
     """
     Extracts all coordinates and visibility for Pose and Right Hand landmarks.
-    
+
     The structure ensures a fixed-length row, filling missing data with 0.0s.
     (Output structure remains identical)
     """
-    row = [time.time()]
-    
+    _ROW_BUF[0] = time.time()
+
     # 1. Pose Landmarks (33 landmarks * 4 values: x, y, z, visibility)
     if results.pose_landmarks:
-        for landmark in results.pose_landmarks.landmark:
-            row.extend([landmark.x, landmark.y, landmark.z, landmark.visibility])
+        for i, lm in enumerate(results.pose_landmarks.landmark):
+            _ROW_BUF[1 + 4 * i:5 + 4 * i] = (lm.x, lm.y, lm.z, lm.visibility)
     else:
-        row.extend([0.0] * 132) 
+        _ROW_BUF[1:133] = 0.0
 
     # 2. Right Hand Landmarks (21 landmarks * 3 values: x, y, z)
     if results.right_hand_landmarks:
-        for landmark in results.right_hand_landmarks.landmark:
-            row.extend([landmark.x, landmark.y, landmark.z])
+        for i, lm in enumerate(results.right_hand_landmarks.landmark):
+            _ROW_BUF[133 + 3 * i:136 + 3 * i] = (lm.x, lm.y, lm.z)
     else:
-        row.extend([0.0] * 63)
-        
-    return row
+        _ROW_BUF[133:] = 0.0
 
-# --- CSV HEADER GENERATION ---
+    return _ROW_BUF.copy()
+
+# --- COLUMN NAME GENERATION ---
 def generate_header():
     """
-    Dynamically creates a comprehensive CSV header for all logged data fields.
+    Dynamically creates the column names for all logged data fields.
     (Output structure remains identical)
     """
     header = ['timestamp']
@@ -73,91 +121,286 @@ def generate_header():
         
     return header
 
+# Precomputed once at import; the column names never change at runtime.
+# generate_header() stays callable on its own.
+_HEADER = generate_header()
+
+# Columnar schema for the Parquet output: landmark values store in 4 bytes
+# (float32) what CSV spent ~20 text bytes on; the timestamp keeps float64 so
+# it retains sub-second precision.
+_SCHEMA = pa.schema([pa.field('timestamp', pa.float64())] +
+                    [pa.field(name, pa.float32()) for name in _HEADER[1:]])
+
+# --- PER-FRAME PROCESSING ---
+def mirror_landmarks(results):
+    """
+    Mirrors normalized landmark x coordinates in place (x -> 1 - x).
+
+    A scalar op on ~75 landmarks, replacing the full-frame cv2.flip memcpy
+    the reader used to do before inference. Geometry only: left/right
+    landmark labels are untouched.
+    """
+    for lms in (results.pose_landmarks, results.left_hand_landmarks,
+                results.right_hand_landmarks):
+        if lms:
+            for lm in lms.landmark:
+                lm.x = 1.0 - lm.x
+
+def process_frame(holistic, frame, rgb_buf, disp_buf):
+    """
+    Runs Holistic inference on one (unflipped) frame and draws its mirrored
+    landmarks onto a reused display buffer.
+
+    Each camera owns one Holistic graph and reused buffers; TFLite releases
+    the GIL during inference, so several of these calls running on a thread
+    pool scale across cores (MediaPipe cannot batch frames on a single
+    graph). Returns (results, rgb_buf, disp_buf) so the caller keeps the
+    buffers.
+    """
+    # Downsample for inference only. MediaPipe resizes to its own input
+    # tensor size internally, so this loses no accuracy, and the landmarks
+    # it returns are normalized [0,1] coordinates that drawing/logging on
+    # the full frame can use unchanged.
+    small = cv2.resize(frame, (PROCESS_WIDTH, PROCESS_HEIGHT),
+                       interpolation=cv2.INTER_AREA)
+
+    # Convert the BGR image to RGB (into the reused buffer) and process it.
+    # Marking the buffer read-only lets MediaPipe skip its internal
+    # defensive copy.
+    if rgb_buf is None or rgb_buf.shape != small.shape:
+        rgb_buf = np.empty_like(small)
+    cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+    # MediaPipe's binding silently copies non-contiguous arrays; guard here
+    # so view-producing edits upstream (slicing, ::-1 flips) can never
+    # reintroduce that hidden per-frame copy.
+    if not rgb_buf.flags['C_CONTIGUOUS']:
+        rgb_buf = np.ascontiguousarray(rgb_buf)
+    rgb_buf.flags.writeable = False
+    results = holistic.process(rgb_buf)
+    rgb_buf.flags.writeable = True
+
+    # Mirror in landmark space rather than pixel space. Only the x
+    # coordinates change; left/right labels stay anatomical across pose and
+    # hands, since inference saw the unflipped image. (The old
+    # flip-then-infer pipeline logged mirror-view labels instead: its
+    # RIGHT_* columns held the subject's physical left side.)
+    mirror_landmarks(results)
+
+    # The only remaining full-frame flip is for the on-screen mirror effect,
+    # and it reuses the display buffer instead of allocating per frame.
+    if disp_buf is None or disp_buf.shape != frame.shape:
+        disp_buf = np.empty_like(frame)
+    cv2.flip(frame, 1, dst=disp_buf)
+
+    # --- Draw Landmarks (Professional Visualization) ---
+    # 1. Pose
+    draw_landmarks(disp_buf, results.pose_landmarks, POSE_CONNECTIONS,
+                   POSE_DRAWING_SPEC, POSE_CONNECTIONS_SPEC)
+    # 2. Left Hand
+    draw_landmarks(disp_buf, results.left_hand_landmarks, HAND_CONNECTIONS,
+                   HAND_DRAWING_SPEC, HAND_DRAWING_SPEC)
+    # 3. Right Hand
+    draw_landmarks(disp_buf, results.right_hand_landmarks, HAND_CONNECTIONS,
+                   HAND_DRAWING_SPEC, HAND_DRAWING_SPEC)
+
+    return results, rgb_buf, disp_buf
+
+def open_camera(cam_idx):
+    """
+    Opens a camera on the explicit platform backend, requesting MJPG frames
+    (fast to decode, unlocks 60 FPS at 720p on many webcams) and a
+    single-frame driver buffer to keep latency low.
+    """
+    cap = cv2.VideoCapture(cam_idx, CAPTURE_BACKEND)
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_HEIGHT)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+def parquet_path_for(cam_idx):
+    """Per-camera output path; the single-camera default stays pose_data.parquet."""
+    if len(CAMERA_INDICES) == 1:
+        return OUTPUT_PARQUET_FILE
+    return OUTPUT_PARQUET_FILE.replace('.parquet', f'_cam{cam_idx}.parquet')
+
+# --- PIPELINE THREADS ---
+# Camera I/O and disk I/O run on their own threads so neither stalls the
+# MediaPipe inference loop. Reader -> (read_q) -> main/inference -> (write_q)
+# -> Parquet writer. Both queues are bounded so a slow stage applies backpressure
+# instead of growing memory.
+def camera_reader(cap, read_q, stop_event):
+    """
+    Reader thread: pulls frames from the camera into a bounded queue.
+    Puts None when the camera stops delivering frames.
+    """
+    while not stop_event.is_set():
+        ret, frame = cap.read()
+        if not ret:
+            read_q.put(None)
+            break
+        read_q.put(frame)
+
+def parquet_row_writer(write_q, pq_writer):
+    """
+    Writer thread: drains landmark rows to the Parquet file in columnar
+    batches. A None sentinel flushes the remainder and stops the thread.
+    """
+    batch = []
+
+    def flush():
+        data = np.asarray(batch)
+        arrays = [pa.array(data[:, 0], type=pa.float64())]
+        arrays += [pa.array(data[:, j], type=pa.float32())
+                   for j in range(1, data.shape[1])]
+        pq_writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=_SCHEMA))
+        batch.clear()
+
+    while True:
+        row = write_q.get()
+        if row is None:
+            break
+        batch.append(row)
+        if len(batch) >= ROW_BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+
 # --- MAIN EXECUTION ---
 if __name__ == '__main__':
-    
-    # Setup CSV file for writing
+
+    n_cams = len(CAMERA_INDICES)
+
+    # Setup one Parquet file per camera (separate files avoid writer contention)
+    writers = []
     try:
-        csv_file = open(OUTPUT_CSV_FILE, 'w', newline='')
-        writer = csv.writer(csv_file)
-        writer.writerow(generate_header())
-    except IOError as e:
-        print(f"ERROR: Could not open {OUTPUT_CSV_FILE}. Check permissions.")
+        for idx in CAMERA_INDICES:
+            writers.append(pq.ParquetWriter(parquet_path_for(idx), _SCHEMA,
+                                            compression='lz4'))
+    except (IOError, OSError) as e:
+        print(f"ERROR: Could not open output Parquet file. Check permissions.")
         exit()
 
-    cap = cv2.VideoCapture(0) # Initialize default webcam
-    print(f"--- Pose Tracker Initialized ---")
-    print(f"Live tracking active. Data is being saved to {OUTPUT_CSV_FILE}.")
+    caps = [open_camera(idx) for idx in CAMERA_INDICES]
+    print(f"--- Pose Tracker Initialized ({n_cams} camera(s)) ---")
+    print(f"Live tracking active. Data is being saved to {OUTPUT_PARQUET_FILE}.")
     print("Press 'q' in the video window to quit.")
 
-    # Set up the Holistic model with constants
-    with mp_holistic.Holistic(
-        min_detection_confidence=MIN_DETECTION_CONFIDENCE, 
-        min_tracking_confidence=MIN_TRACKING_CONFIDENCE
-    ) as holistic:
-        
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
+    # Wire up a three-stage pipeline per camera (reader / inference / writer)
+    stop_event = threading.Event()
+    read_qs = [queue.Queue(maxsize=READ_QUEUE_SIZE) for _ in caps]
+    write_qs = [queue.Queue(maxsize=WRITE_QUEUE_SIZE) for _ in caps]
+    reader_threads = [threading.Thread(target=camera_reader,
+                                       args=(cap, rq, stop_event), daemon=True)
+                      for cap, rq in zip(caps, read_qs)]
+    writer_threads = [threading.Thread(target=parquet_row_writer,
+                                       args=(wq, w), daemon=True)
+                      for wq, w in zip(write_qs, writers)]
+    for t in reader_threads + writer_threads:
+        t.start()
+
+    # One Holistic graph, RGB buffer and pool worker per camera. MediaPipe
+    # cannot batch frames on a single graph, so parallelism comes from
+    # independent graphs on threads (the GIL is released inside TFLite).
+    holistics = [mp_holistic.Holistic(
+        min_detection_confidence=MIN_DETECTION_CONFIDENCE,
+        min_tracking_confidence=MIN_TRACKING_CONFIDENCE,
+        model_complexity=MODEL_COMPLEXITY,
+        smooth_landmarks=True
+    ) for _ in caps]
+    rgb_bufs = [None] * n_cams
+    disp_bufs = [None] * n_cams
+    executor = ThreadPoolExecutor(max_workers=n_cams)
+
+    # Measured pipeline FPS (exponential moving average), rather than the
+    # constant the camera advertises via CAP_PROP_FPS.
+    t_prev = time.perf_counter()
+    fps_ema = 0.0
+
+    try:
+        while all(cap.isOpened() for cap in caps):
+            frames = [rq.get() for rq in read_qs]
+            if any(f is None for f in frames):
                 print("Error: Could not read frame from camera.")
                 break
-            
-            # 1. FLIP FRAME FOR MIRROR EFFECT (COOLER OUTPUT)
-            frame = cv2.flip(frame, 1)
-
-            # Convert the BGR image to RGB and process it
-            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = holistic.process(image_rgb)
-            
-            # --- Draw Landmarks (Professional Visualization) ---
-            # 1. Pose
-            mp_drawing.draw_landmarks(frame, results.pose_landmarks, mp_holistic.POSE_CONNECTIONS,
-                                      POSE_DRAWING_SPEC, POSE_CONNECTIONS_SPEC)
-            # 2. Left Hand
-            mp_drawing.draw_landmarks(frame, results.left_hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS,
-                                      HAND_DRAWING_SPEC, HAND_DRAWING_SPEC)
-            # 3. Right Hand
-            mp_drawing.draw_landmarks(frame, results.right_hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS,
-                                      HAND_DRAWING_SPEC, HAND_DRAWING_SPEC)
-
-            # --- Add Status Overlay (COOLER OUTPUT) ---
-            tracking_status = f"FPS: {cap.get(cv2.CAP_PROP_FPS):.1f} | Tracking: "
-            
-            # Check for detected elements to update status
-            if results.pose_landmarks:
-                tracking_status += "BODY | "
-            if results.right_hand_landmarks:
-                 tracking_status += "R_HAND | "
-            if results.left_hand_landmarks:
-                 tracking_status += "L_HAND | "
-            
-            # Draw status bar at the top left
-            cv2.putText(frame, 
-                        tracking_status.strip(' |'), 
-                        (10, 30), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
-            cv2.putText(frame, 
-                        "DATALOG: Active (Press 'q' to save/exit)", 
-                        (10, frame.shape[0] - 10), # Bottom Left Corner
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1, cv2.LINE_AA)
-
-
-            # --- Save Data to CSV ---
-            try:
-                row = extract_full_data(results)
-                writer.writerow(row)
-            except Exception:
-                pass
-
-            # Display the resulting frame
-            cv2.imshow(WINDOW_TITLE, frame)
+
+            # Run inference for all cameras in parallel, then gather
+            futures = [executor.submit(process_frame, holistics[i], frames[i],
+                                       rgb_bufs[i], disp_bufs[i])
+                       for i in range(n_cams)]
+
+            now = time.perf_counter()
+            dt = now - t_prev
+            t_prev = now
+            fps_ema = 0.9 * fps_ema + 0.1 / (dt + 1e-9)
+
+            for i, future in enumerate(futures):
+                results, rgb_bufs[i], disp_bufs[i] = future.result()
+                frame = disp_bufs[i]
+
+                # --- Add Status Overlay (COOLER OUTPUT) ---
+                tracking_status = f"FPS: {fps_ema:.1f} | Tracking: "
+
+                # Check for detected elements to update status
+                if results.pose_landmarks:
+                    tracking_status += "BODY | "
+                if results.right_hand_landmarks:
+                    tracking_status += "R_HAND | "
+                if results.left_hand_landmarks:
+                    tracking_status += "L_HAND | "
+
+                # Draw status bar at the top left
+                cv2.putText(frame,
+                            tracking_status.strip(' |'),
+                            (10, 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
+                # Blit the pre-rendered banner into the bottom left corner,
+                # clipped to the frame: drivers may fall back to a smaller
+                # mode than open_camera requested.
+                bh = min(_BANNER_H, frame.shape[0] - 5)
+                bw = min(_BANNER_W, frame.shape[1] - 10)
+                if bh > 0 and bw > 0:
+                    banner_area = frame[frame.shape[0] - bh - 5:frame.shape[0] - 5,
+                                        10:10 + bw]
+                    np.copyto(banner_area, _BANNER[:bh, :bw],
+                              where=_BANNER_MASK[:bh, :bw])
+
+                # --- Hand the row off to this camera's Parquet writer thread ---
+                try:
+                    write_qs[i].put(extract_full_data(results))
+                except Exception:
+                    pass
+
+                # Display the resulting frame
+                title = WINDOW_TITLE if n_cams == 1 else f"{WINDOW_TITLE} [cam {CAMERA_INDICES[i]}]"
+                cv2.imshow(title, frame)
 
             if cv2.waitKey(10) & 0xFF == ord('q'):
                 break
 
-    # --- Cleanup ---
-    cap.release()
-    cv2.destroyAllWindows()
-    csv_file.close()
+    finally:
+        # --- Cleanup ---
+        # Stop the readers, unblock any waiting on a full queue, then send
+        # each writer its sentinel so remaining rows are flushed.
+        stop_event.set()
+        for rq in read_qs:
+            while not rq.empty():
+                try:
+                    rq.get_nowait()
+                except queue.Empty:
+                    break
+        for wq in write_qs:
+            wq.put(None)
+        for t in writer_threads:
+            t.join(timeout=2.0)
+        executor.shutdown(wait=False)
+        for holistic in holistics:
+            holistic.close()
+        for cap in caps:
+            cap.release()
+        cv2.destroyAllWindows()
+        for w in writers:
+            w.close()
+
     print("--- Tracking Complete ---")
-    print(f"Data logging finished. Results saved to {OUTPUT_CSV_FILE}.")
\ No newline at end of file
+    print(f"Data logging finished. Results saved to {OUTPUT_PARQUET_FILE}.")
@@ -0,0 +1,16 @@
+"""
+WSGI entry point for production servers.
+
+Run the Module 7 web app under Gunicorn (already in requirements.txt) with:
+
+    gunicorn -w 4 -k gthread --threads 2 --preload wsgi:app
+
+--preload imports the app once in the master process so the calibration
+constants and intrinsics cache are shared across workers. For local
+development, `python app.py` still starts the single-threaded dev server.
+"""
+
+from app import app
+
+if __name__ == '__main__':
+    app.run()